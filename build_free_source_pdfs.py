@@ -15,15 +15,26 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import io
+import os
+import random
 import re
 import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
+import lxml.etree
+import orjson
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests.adapters import HTTPAdapter
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import getFont
 from reportlab.pdfgen import canvas
 
 
@@ -35,61 +46,253 @@ DEFAULT_HEADERS = {
     "Accept": "application/json",
 }
 
+# Wikimedia responses barely change between rebuilds; keep them on disk for a day.
+CACHE_PATH = ".wiki_cache"
+CACHE_TTL_SECONDS = 24 * 3600
+
+# One pooled session for the whole run so repeated Wikimedia calls reuse the
+# same keep-alive TLS connection instead of re-handshaking per request.
+_SESSION = requests_cache.CachedSession(
+    CACHE_PATH,
+    backend="sqlite",
+    expire_after=CACHE_TTL_SECONDS,
+    allowable_codes=(200,),
+)
+_SESSION.headers.update(DEFAULT_HEADERS)
+
+# Transient failures (timeouts, 429, 5xx) are retried with exponential backoff.
+RETRY_ATTEMPTS = 4
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+# Player fetches are network-bound, so a handful of threads overlap the RTTs.
+DEFAULT_WORKERS = 8
+# MediaWiki caps multi-title queries (and wbgetentities ids) at 50 for regular clients.
+WIKI_TITLES_PER_REQUEST = 50
+# TextExtracts clamps `exsentences` to 10 (with a warning); ask for what we get.
+EXTRACT_SENTENCES = 10
+RETRIEVED_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
+# Infobox cricketer params -> labels used by the rendered infobox.
+INFOBOX_FIELD_LABELS = {
+    "fullname": "Full name",
+    "birth_date": "Born",
+    "batting": "Batting",
+    "bowling": "Bowling",
+    "role": "Role",
+    "country": "National side",
+}
+# Debuts are split over `<fmt>debutdate`, `<fmt>debutyear` and `<fmt>debutagainst`;
+# the rendered infobox joins them as "20 June 2011 v West Indies".
+INFOBOX_DEBUT_LABELS = {
+    "test": "Test debut",
+    "odi": "ODI debut",
+    "t20i": "T20I debut",
+}
+# Per-column career stats (`matches1`, `runs1`, ...), in rendered row order.
+INFOBOX_STAT_LABELS = [
+    ("matches", "Matches"),
+    ("runs", "Runs scored"),
+    ("bat avg", "Batting average"),
+    ("100s/50s", "100s/50s"),
+    ("top score", "Top score"),
+    ("wickets", "Wickets"),
+    ("bowl avg", "Bowling average"),
+    ("best bowling", "Best bowling"),
+    ("catches/stumpings", "Catches/stumpings"),
+]
+
+HELV = "Helvetica"
+HELV_BOLD = "Helvetica-Bold"
+# Resolve both faces once at import; every canvas then reuses the cached AFM metrics.
+_HELV_FONT = getFont(HELV)
+getFont(HELV_BOLD)
+# Helvetica glyph widths (1/1000 em) for ASCII, so wrapping never calls into reportlab
+# for typical English bios; other characters fall back to the font's own lookup.
+_HELV_WIDTHS = [_HELV_FONT.stringWidth(chr(i), 1000) for i in range(128)]
+
+_BRACKET_RE = re.compile(r"\[[0-9]+\]")
+_WS_RE = re.compile(r"\s+")
+_WDTIME_RE = re.compile(r"^\+(\d{4}-\d{2}-\d{2})T")
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_-]+")
+_INFOBOX_START_RE = re.compile(r"\{\{\s*Infobox[ _]cricketer\b", re.IGNORECASE)
+_WT_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_WT_REF_RE = re.compile(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+_WT_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_WT_TAG_RE = re.compile(r"<[^>]+>")
+_WT_LINK_RE = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]")
+_WT_TEMPLATE_RE = re.compile(r"\{\{([^{}]*)\}\}")
+
+
+def mount_connection_pool(workers: int) -> None:
+    """
+    Size the per-host pool to the fetch concurrency. With pool_block set, a thread
+    waits for a warm connection instead of opening a one-off one that urllib3
+    would discard (and re-handshake) once the pool is full.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=max(1, workers), pool_block=True, max_retries=0
+    )
+    _SESSION.mount("https://", adapter)
+
+
+mount_connection_pool(DEFAULT_WORKERS)
+
 
 def get_json(url: str, params: Dict, timeout: int = 30) -> Dict:
     """HTTP GET with retries and Wikimedia-friendly headers."""
-    session = requests.Session()
-    session.headers.update(DEFAULT_HEADERS)
+    return orjson.loads(get_response(url, params, timeout).content)
+
+
+def get_response(url: str, params: Dict, timeout: int = 30) -> requests.Response:
     # `origin=*` is harmless server-side and can reduce some gateway/CORS issues.
     if "origin" not in params:
         params["origin"] = "*"
+    # v2 JSON drops the legacy `*` wrappers and returns query pages as a list.
+    params.setdefault("formatversion", 2)
 
     last_exc: Exception | None = None
-    for attempt in range(3):
+    for attempt in range(RETRY_ATTEMPTS):
+        last_try = attempt == RETRY_ATTEMPTS - 1
         try:
-            r = session.get(url, params=params, timeout=timeout)
-            if r.status_code in (429, 500, 502, 503, 504):
-                time.sleep(1.5 * (attempt + 1))
-                continue
-            r.raise_for_status()
-            return r.json()
-        except Exception as exc:
+            r = _SESSION.get(url, params=params, timeout=timeout)
+        except (requests.Timeout, requests.ConnectionError) as exc:
             last_exc = exc
-            time.sleep(1.5 * (attempt + 1))
+            if not last_try:
+                time.sleep(backoff_delay(attempt))
+            continue
+        if r.status_code in RETRY_STATUSES:
+            last_exc = requests.HTTPError(f"HTTP {r.status_code}", response=r)
+            if not last_try:
+                time.sleep(retry_after_seconds(r) or backoff_delay(attempt))
+            continue
+        # Anything else (404, 403, ...) is permanent; retrying would only waste time.
+        r.raise_for_status()
+        return r
     raise RuntimeError(f"Request failed after retries for {url}: {last_exc}")
 
 
-def fetch_wikipedia_page_data(player_name: str) -> Dict:
-    """Fetch plaintext extract, canonical URL, wikidata id, and infobox fields."""
-    params = {
-        "action": "query",
-        "format": "json",
-        "prop": "extracts|info|pageprops",
-        "inprop": "url",
-        "explaintext": 1,
-        "titles": player_name,
-        "redirects": 1,
-    }
-    payload = get_json(WIKIPEDIA_API, params=params, timeout=30)
-    pages = payload.get("query", {}).get("pages", {})
-    page = next(iter(pages.values()))
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so parallel workers don't retry in lockstep."""
+    delay = RETRY_BASE_DELAY * 2**attempt + random.uniform(0, RETRY_BASE_DELAY)
+    return min(delay, RETRY_MAX_DELAY)
 
-    if "missing" in page:
-        raise ValueError(f"Wikipedia page not found for: {player_name}")
 
-    title = page.get("title", player_name)
-    extract = page.get("extract", "").strip()
-    fullurl = page.get("fullurl", f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}")
-    wikibase_item = page.get("pageprops", {}).get("wikibase_item")
+def retry_after_seconds(r: requests.Response) -> float:
+    """Seconds from a numeric Retry-After header (0 if absent or a date)."""
+    try:
+        return min(max(float(r.headers.get("Retry-After", 0)), 0.0), RETRY_MAX_DELAY * 4)
+    except ValueError:
+        return 0.0
+
+
+def fetched_at(r: requests.Response) -> dt.datetime:
+    """When the response's content was fetched: its cache entry's age, or now."""
+    created = getattr(r, "created_at", None) if getattr(r, "from_cache", False) else None
+    if created is None:
+        return dt.datetime.now(dt.timezone.utc)
+    # requests-cache < 1.2 stores naive UTC times; make them comparable with now().
+    return created if created.tzinfo else created.replace(tzinfo=dt.timezone.utc)
+
+
+def iter_query_results(params: Dict) -> Iterator[Tuple[Dict, dt.datetime]]:
+    """Yield the `query` block and fetch time of every continuation response."""
+    cont: Dict[str, str] = {}
+    while True:
+        r = get_response(WIKIPEDIA_API, params={**params, **cont}, timeout=30)
+        payload = orjson.loads(r.content)
+        yield payload.get("query", {}), fetched_at(r)
+        cont = payload.get("continue", {})
+        if not cont:
+            return
+
+
+def fetch_wikipedia_pages_bulk(player_names: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch extract, canonical URL, wikidata id and wikitext for many titles at once.
+    Returns dict keyed by the requested name; missing pages are left out.
+    """
+    out: Dict[str, Dict] = {}
+    for start in range(0, len(player_names), WIKI_TITLES_PER_REQUEST):
+        chunk = player_names[start : start + WIKI_TITLES_PER_REQUEST]
+        params = {
+            "action": "query",
+            "format": "json",
+            "prop": "extracts|info|pageprops|revisions",
+            "inprop": "url",
+            "explaintext": 1,
+            # Lead section only, capped: the PDF needs a summary, not the full article.
+            "exintro": 1,
+            "exsentences": EXTRACT_SENTENCES,
+            "exlimit": "max",
+            "rvprop": "content",
+            "rvslots": "main",
+            "titles": "|".join(chunk),
+            "redirects": 1,
+        }
+        pages_by_title: Dict[str, Dict] = {}
+        aliases: Dict[str, str] = {}
+        # Extracts and revisions may be spread over several continuation responses.
+        # Stamp pages with the oldest response they came from, which may be a cache
+        # entry fetched well before this run.
+        retrieved = None
+        for query, when in iter_query_results(params):
+            retrieved = when if retrieved is None else min(retrieved, when)
+            for hop in query.get("normalized", []) + query.get("redirects", []):
+                aliases[hop["from"]] = hop["to"]
+            for page in query.get("pages", []):
+                pages_by_title.setdefault(page.get("title", ""), {}).update(page)
+
+        for name in chunk:
+            title = name
+            for _ in range(3):  # normalized -> redirect -> (rare) second redirect
+                if title not in aliases:
+                    break
+                title = aliases[title]
+            page = pages_by_title.get(title)
+            if not page or "missing" in page or "invalid" in page:
+                continue
+            title = page.get("title", name)
+            revisions = page.get("revisions") or [{}]
+            out[name] = {
+                "title": title,
+                "extract": page.get("extract", "").strip(),
+                "url": page.get(
+                    "fullurl", f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+                ),
+                "wikibase_item": page.get("pageprops", {}).get("wikibase_item"),
+                "wikitext": revisions[0].get("slots", {}).get("main", {}).get("content", ""),
+                "retrieved_at": retrieved.strftime(RETRIEVED_FORMAT),
+            }
+    return out
+
 
-    html = fetch_wikipedia_html(title)
-    infobox = parse_infobox_fields(html)
+def fetch_player_sources(
+    player_name: str,
+    page: Dict | None = None,
+    wdata: Dict[str, str] | None = None,
+) -> Dict:
+    """
+    Network half of a player build: page data, wikidata fields, and the rendered
+    infobox HTML when the wikitext has no cricketer infobox to parse.
+    Returns a plain (picklable) dict for render_player_pdf.
+    """
+    if page is None:
+        page = fetch_wikipedia_pages_bulk([player_name]).get(player_name)
+    if not page:
+        raise ValueError(f"Wikipedia page not found for: {player_name}")
+
+    infobox_html = ""
+    if not _INFOBOX_START_RE.search(page.get("wikitext", "")):
+        # Unusual templates: fall back to scraping the rendered infobox.
+        infobox_html = fetch_wikipedia_html(page["title"])
+    if wdata is None:
+        wdata = fetch_wikidata_labels(page["wikibase_item"]) if needs_wikidata(page) else {}
     return {
-        "title": title,
-        "extract": extract,
-        "url": fullurl,
-        "wikibase_item": wikibase_item,
-        "infobox": infobox,
+        "retrieved_at": dt.datetime.now(dt.timezone.utc).strftime(RETRIEVED_FORMAT),
+        **page,
+        "infobox_html": infobox_html,
+        "wikidata": wdata,
     }
 
 
@@ -103,47 +306,207 @@ def fetch_wikipedia_html(page_title: str) -> str:
         "redirects": 1,
     }
     payload = get_json(WIKIPEDIA_API, params=params, timeout=30)
-    return payload.get("parse", {}).get("text", {}).get("*", "")
+    return payload.get("parse", {}).get("text", "")
 
 
 def parse_infobox_fields(html: str) -> Dict[str, str]:
     """Extract key/value rows from the page infobox."""
-    soup = BeautifulSoup(html, "html.parser")
-    box = soup.find("table", class_=lambda c: c and "infobox" in c)
     fields: Dict[str, str] = {}
-    if not box:
+    if not html.strip():
         return fields
 
-    for row in box.find_all("tr"):
-        th = row.find("th")
-        td = row.find("td")
-        if not th or not td:
+    # Stream the page and stop at the infobox, so the article body after it is never
+    # built into a tree, and tables that precede it are released as they close.
+    events = lxml.etree.iterparse(
+        io.BytesIO(html.encode("utf-8")),
+        events=("end",),
+        tag="table",
+        html=True,
+        encoding="utf-8",
+    )
+    try:
+        for _, el in events:
+            if not is_infobox(el):
+                if not any(is_infobox(a) for a in el.iterancestors("table")):
+                    el.clear()
+                    while el.getprevious() is not None:
+                        del el.getparent()[0]
+                continue
+
+            # TemplateStyles blocks sit inside some cells; their CSS is not cell text.
+            # Empty them in place: removing the element would also drop its tail,
+            # which is the cell text that follows it.
+            for junk in el.xpath(".//style | .//script"):
+                junk.text = None
+                del junk[:]
+            for row in el.xpath(".//tr[th and td]"):
+                key = clean_text(node_text(row.find("th")))
+                val = clean_text(node_text(row.find("td")))
+                if key and val:
+                    fields[key] = val
+            el.clear()
+            break
+    except lxml.etree.XMLSyntaxError:
+        pass
+    return fields
+
+
+def is_infobox(el: lxml.etree._Element) -> bool:
+    return "infobox" in (el.get("class") or "").split()
+
+
+def node_text(el: lxml.etree._Element) -> str:
+    """Join an element's text pieces with spaces, like bs4's get_text(" ", strip=True)."""
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+def parse_infobox_wikitext(wikitext: str) -> Dict[str, str]:
+    """
+    Extract fields from the `{{Infobox cricketer}}` template in page wikitext.
+    Keys use the same labels as the rendered infobox (Born, Role, ...).
+    """
+    params = split_infobox_params(wikitext)
+    fields: Dict[str, str] = {}
+    if not params:
+        return fields
+
+    for key, label in INFOBOX_FIELD_LABELS.items():
+        val = clean_wikitext(params.get(key, ""))
+        if val:
+            fields[label] = val
+    place = clean_wikitext(params.get("birth_place", ""))
+    if place:
+        fields["Born"] = f"{fields['Born']}, {place}" if "Born" in fields else place
+    for fmt, label in INFOBOX_DEBUT_LABELS.items():
+        date = clean_wikitext(params.get(f"{fmt}debutdate", ""))
+        year = clean_wikitext(params.get(f"{fmt}debutyear", ""))
+        against = clean_wikitext(params.get(f"{fmt}debutagainst", ""))
+        val = " ".join(p for p in (date, year, f"v {against}" if against else "") if p)
+        if val:
+            fields[label] = val
+
+    stats = []
+    for n in range(1, 5):
+        column = clean_wikitext(params.get(f"column{n}", ""))
+        if not column:
             continue
-        key = clean_text(th.get_text(" ", strip=True))
-        val = clean_text(td.get_text(" ", strip=True))
-        if key and val:
-            fields[key] = val
+        cells = []
+        for key, label in INFOBOX_STAT_LABELS:
+            val = clean_wikitext(params.get(f"{key}{n}", ""))
+            if val:
+                cells.append(f"{label} {val}")
+        if cells:
+            stats.append(f"{column}: {', '.join(cells)}")
+    if stats:
+        fields["Career statistics"] = "; ".join(stats)
     return fields
 
 
+def split_infobox_params(wikitext: str) -> Dict[str, str]:
+    """Return the raw `key = value` params of the cricketer infobox template."""
+    m = _INFOBOX_START_RE.search(wikitext)
+    if not m:
+        return {}
+
+    # Split on top-level pipes only; nested templates and links have their own.
+    parts: List[str] = []
+    braces, brackets = 1, 0
+    start = i = m.end()
+    while i < len(wikitext):
+        pair = wikitext[i : i + 2]
+        if pair in ("{{", "}}", "[[", "]]"):
+            if pair == "{{":
+                braces += 1
+            elif pair == "}}":
+                braces -= 1
+                if braces == 0:
+                    break
+            elif pair == "[[":
+                brackets += 1
+            else:
+                brackets = max(0, brackets - 1)
+            i += 2
+            continue
+        if wikitext[i] == "|" and braces == 1 and brackets == 0:
+            parts.append(wikitext[start:i])
+            start = i + 1
+        i += 1
+    parts.append(wikitext[start:i])
+
+    params: Dict[str, str] = {}
+    for part in parts[1:]:  # parts[0] is the rest of the template name
+        key, sep, val = part.partition("=")
+        if sep:
+            params[key.strip().lower()] = val.strip()
+    return params
+
+
+def clean_wikitext(value: str) -> str:
+    """Flatten a wikitext value (links, refs, simple templates) to plain text."""
+    if not value:
+        return ""
+    value = _WT_COMMENT_RE.sub("", value)
+    value = _WT_REF_RE.sub("", value)
+    value = _WT_BR_RE.sub(" ", value)
+    value = _WT_TAG_RE.sub("", value)
+    value = _WT_LINK_RE.sub(lambda m: m.group(1), value)
+    for _ in range(5):  # innermost templates first
+        value, n = _WT_TEMPLATE_RE.subn(lambda m: render_template(m.group(1)), value)
+        if not n:
+            break
+    value = value.replace("'''", "").replace("''", "").replace("&nbsp;", " ")
+    return clean_text(value)
+
+
+def render_template(inner: str) -> str:
+    """Render the few inline templates used in cricketer infoboxes."""
+    parts = [p.strip() for p in inner.split("|")]
+    name = parts[0].lower()
+    args = [p for p in parts[1:] if p and "=" not in p]
+    if name.startswith(("birth date", "death date", "start date", "dob")):
+        nums = [a for a in args if a.isdigit()][:3]
+        if len(nums) == 3:
+            return f"{nums[0]}-{int(nums[1]):02d}-{int(nums[2]):02d}"
+        return "-".join(nums)
+    if name in ("hlist", "ubl", "unbulleted list", "flatlist", "plainlist", "nowrap", "nobr", "small"):
+        return ", ".join(args)
+    return ""
+
+
+def fetch_wikidata_labels_bulk(entity_ids: List[str]) -> Dict[str, Dict[str, str]]:
+    """Get Wikidata claim labels for many entities, keyed by entity id."""
+    ids = list(dict.fromkeys(i for i in entity_ids if i))
+    out: Dict[str, Dict[str, str]] = {}
+    for start in range(0, len(ids), WIKI_TITLES_PER_REQUEST):
+        params = {
+            "action": "wbgetentities",
+            "format": "json",
+            "ids": "|".join(ids[start : start + WIKI_TITLES_PER_REQUEST]),
+            "languages": "en",
+            "props": "labels|claims",
+        }
+        payload = get_json(WIKIDATA_API, params=params, timeout=30)
+        for entity_id, entity in payload.get("entities", {}).items():
+            claims = entity.get("claims", {})
+            fields: Dict[str, str] = {}
+            dob = extract_time_claim(claims, "P569")  # date of birth
+            if dob:
+                fields["Date of birth (Wikidata)"] = dob
+            out[entity_id] = fields
+    return out
+
+
+def needs_wikidata(page: Dict) -> bool:
+    """Wikidata only contributes the date of birth; skip it when the infobox has one."""
+    if not page.get("wikibase_item"):
+        return False
+    return not clean_wikitext(split_infobox_params(page.get("wikitext", "")).get("birth_date", ""))
+
+
+@lru_cache(maxsize=None)
 def fetch_wikidata_labels(entity_id: str) -> Dict[str, str]:
     """Get a few human-friendly labels from Wikidata entity claims."""
-    params = {
-        "action": "wbgetentities",
-        "format": "json",
-        "ids": entity_id,
-        "languages": "en",
-        "props": "labels|claims",
-    }
-    payload = get_json(WIKIDATA_API, params=params, timeout=30)
-    entity = payload.get("entities", {}).get(entity_id, {})
-    claims = entity.get("claims", {})
-
-    out: Dict[str, str] = {}
-    dob = extract_time_claim(claims, "P569")  # date of birth
-    if dob:
-        out["Date of birth (Wikidata)"] = dob
-    return out
+    return fetch_wikidata_labels_bulk([entity_id]).get(entity_id, {})
 
 
 def extract_time_claim(claims: Dict, prop_id: str) -> str:
@@ -152,15 +515,15 @@ def extract_time_claim(claims: Dict, prop_id: str) -> str:
         return ""
     try:
         raw = vals[0]["mainsnak"]["datavalue"]["value"]["time"]
-        m = re.match(r"^\+(\d{4}-\d{2}-\d{2})T", raw)
+        m = _WDTIME_RE.match(raw)
         return m.group(1) if m else ""
     except Exception:
         return ""
 
 
 def clean_text(value: str) -> str:
-    value = re.sub(r"\[[0-9]+\]", "", value)
-    value = re.sub(r"\s+", " ", value).strip()
+    value = _BRACKET_RE.sub("", value)
+    value = _WS_RE.sub(" ", value).strip()
     return value
 
 
@@ -187,34 +550,44 @@ def pick_relevant_infobox_fields(infobox: Dict[str, str]) -> List[Tuple[str, str
 def write_pdf(output_path: Path, title: str, sections: List[Tuple[str, str]]) -> None:
     """Write simple readable PDF using reportlab."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    c = canvas.Canvas(str(output_path), pagesize=A4)
+    c = canvas.Canvas(str(output_path), pagesize=A4, pageCompression=1)
     width, height = A4
     x = 2 * cm
     y = height - 2 * cm
     max_width = width - 4 * cm
     line_h = 14
-
-    c.setFont("Helvetica-Bold", 14)
+    cur_font: Tuple[str, float] | None = None
+
+    def set_font(name: str, size: float) -> None:
+        # Each setFont emits a Tf operator; skip it when nothing changes.
+        nonlocal cur_font
+        if cur_font != (name, size):
+            c.setFont(name, size)
+            cur_font = (name, size)
+
+    def new_page() -> float:
+        nonlocal cur_font
+        c.showPage()
+        cur_font = None  # showPage resets the graphics state, font included
+        return height - 2 * cm
+
+    set_font(HELV_BOLD, 14)
     c.drawString(x, y, title)
     y -= 22
 
-    c.setFont("Helvetica", 10)
     for heading, body in sections:
         if y < 3 * cm:
-            c.showPage()
-            c.setFont("Helvetica", 10)
-            y = height - 2 * cm
+            y = new_page()
 
-        c.setFont("Helvetica-Bold", 11)
+        set_font(HELV_BOLD, 11)
         c.drawString(x, y, heading)
         y -= 14
 
-        c.setFont("Helvetica", 10)
-        for line in wrap_text(body, c, max_width):
+        set_font(HELV, 10)
+        for line in wrap_text(body, max_width):
             if y < 2.5 * cm:
-                c.showPage()
-                c.setFont("Helvetica", 10)
-                y = height - 2 * cm
+                y = new_page()
+                set_font(HELV, 10)
             c.drawString(x, y, line)
             y -= line_h
         y -= 8
@@ -222,28 +595,54 @@ def write_pdf(output_path: Path, title: str, sections: List[Tuple[str, str]]) ->
     c.save()
 
 
-def wrap_text(text: str, c: canvas.Canvas, max_width: float) -> List[str]:
+def word_units(word: str) -> float:
+    """Width of `word` in Helvetica glyph units (1/1000 em, whole numbers)."""
+    total = 0.0
+    for ch in word:
+        code = ord(ch)
+        total += _HELV_WIDTHS[code] if code < 128 else _HELV_FONT.stringWidth(ch, 1000)
+    return total
+
+
+def wrap_text(text: str, max_width: float, size: float = 10) -> List[str]:
     words = text.split()
     if not words:
         return [""]
+    # Helvetica has no kerning, so a line's width is the sum of its words and spaces.
+    # With cum[i] = total width of words[:i], each followed by a space, words[start:end]
+    # fit when cum[end] <= cum[start] + max_width + space, so each line break is one
+    # binary search over the prefix sums instead of a per-word comparison. Sums stay in
+    # whole glyph units so ties at the margin are exact.
+    space_u = word_units(" ")
+    limit_u = max_width * 1000 / size + space_u
+    cum = list(accumulate((word_units(w) + space_u for w in words), initial=0.0))
     lines = []
-    current = words[0]
-    for w in words[1:]:
-        candidate = f"{current} {w}"
-        if c.stringWidth(candidate, "Helvetica", 10) <= max_width:
-            current = candidate
-        else:
-            lines.append(current)
-            current = w
-    lines.append(current)
+    start = 0
+    while start < len(words):
+        end = bisect_right(cum, cum[start] + limit_u, lo=start + 1) - 1
+        end = max(end, start + 1)  # an over-long word still gets its own line
+        lines.append(" ".join(words[start:end]))
+        start = end
     return lines
 
 
-def build_player_pdf(player_name: str, output_dir: Path) -> Path:
-    data = fetch_wikipedia_page_data(player_name)
+def build_player_pdf(
+    player_name: str,
+    output_dir: Path,
+    page: Dict | None = None,
+    wdata: Dict[str, str] | None = None,
+) -> Path:
+    return render_player_pdf(fetch_player_sources(player_name, page, wdata), output_dir)
+
+
+def render_player_pdf(data: Dict, output_dir: Path) -> Path:
+    """CPU half of a player build: parse the infobox and write the PDF (no network)."""
     title = data["title"]
-    infobox = data["infobox"]
+    infobox = parse_infobox_wikitext(data["wikitext"]) or parse_infobox_fields(
+        data["infobox_html"]
+    )
     wikidata_id = data["wikibase_item"]
+    wdata = data["wikidata"]
 
     sections: List[Tuple[str, str]] = []
     sections.append(("Player Name", title))
@@ -260,14 +659,11 @@ def build_player_pdf(player_name: str, output_dir: Path) -> Path:
     summary = data["extract"] or "No summary text available."
     sections.append(("Biography and Career Summary (Wikipedia)", summary))
 
-    if wikidata_id:
-        wdata = fetch_wikidata_labels(wikidata_id)
-        if wdata:
-            sections.append(
-                ("Wikidata Fields", " | ".join([f"{k}: {v}" for k, v in wdata.items()]))
-            )
+    if wdata:
+        sections.append(
+            ("Wikidata Fields", " | ".join([f"{k}: {v}" for k, v in wdata.items()]))
+        )
 
-    retrieved_at = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
     sections.append(
         (
             "Data Source and License",
@@ -275,17 +671,20 @@ def build_player_pdf(player_name: str, output_dir: Path) -> Path:
                 "Primary source: Wikipedia (CC BY-SA), free public access. "
                 f"URL: {data['url']}. "
                 f"Wikidata entity: {wikidata_id or 'N/A'}. "
-                f"Retrieved: {retrieved_at}."
+                f"Retrieved: {data['retrieved_at']}."
             ),
         )
     )
 
-    safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", title).strip("_")
-    output_path = output_dir / f"{safe_name}.pdf"
+    output_path = output_dir / f"{output_stem(title)}.pdf"
     write_pdf(output_path, f"Cricketer Profile: {title}", sections)
     return output_path
 
 
+def output_stem(title: str) -> str:
+    return _SAFE_RE.sub("_", title).strip("_")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate free-source cricketer PDFs.")
     parser.add_argument(
@@ -295,15 +694,76 @@ def main() -> None:
         help='One or more player names, e.g. --players "Virat Kohli" "MS Dhoni"',
     )
     parser.add_argument("--output-dir", default="data", help="Directory for generated PDFs.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Players fetched concurrently.",
+    )
     args = parser.parse_args()
 
     out_dir = Path(args.output_dir)
-    for player in args.players:
+    workers = max(1, min(args.workers, len(args.players)))
+    mount_connection_pool(workers)
+    # One failed batch only costs its own players; the rest of the run carries on.
+    pages: Dict[str, Dict] = {}
+    page_errors: Dict[str, Exception] = {}
+    for start in range(0, len(args.players), WIKI_TITLES_PER_REQUEST):
+        chunk = args.players[start : start + WIKI_TITLES_PER_REQUEST]
         try:
-            pdf_path = build_player_pdf(player, out_dir)
-            print(f"[OK] Generated: {pdf_path}")
+            pages.update(fetch_wikipedia_pages_bulk(chunk))
         except Exception as exc:
-            print(f"[ERROR] {player}: {exc}")
+            page_errors.update((player, exc) for player in chunk)
+    try:
+        wikidata = fetch_wikidata_labels_bulk(
+            [p["wikibase_item"] for p in pages.values() if needs_wikidata(p)]
+        )
+    except Exception as exc:
+        print(f"[WARN] Wikidata unavailable: {exc}")
+        wikidata = {}
+    fetched: List[Tuple[str, Dict]] = []
+    claimed: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for player in args.players:
+            if player in page_errors:
+                print(f"[ERROR] {player}: {page_errors[player]}")
+                continue
+            page = pages.get(player)
+            if not page:
+                print(f"[ERROR] {player}: Wikipedia page not found for: {player}")
+                continue
+            # Names that resolve to the same page (or file name) would be rendered
+            # concurrently into the same PDF; build each output once.
+            stem = output_stem(page["title"])
+            if stem in claimed:
+                print(f"[SKIP] {player}: same page as {claimed[stem]!r}")
+                continue
+            claimed[stem] = player
+            wdata = wikidata.get(page["wikibase_item"], {})
+            futures.append((player, pool.submit(fetch_player_sources, player, page, wdata)))
+        for player, future in futures:
+            try:
+                fetched.append((player, future.result()))
+            except Exception as exc:
+                print(f"[ERROR] {player}: {exc}")
+    # Drop every other reference to the raw wikitext/HTML so each payload is freed
+    # as soon as its render finishes, instead of all of them living until exit.
+    del pages, futures
+    if not fetched:
+        return
+
+    # Parsing and reportlab rendering are CPU-bound Python; use separate processes.
+    procs = max(1, min(os.cpu_count() or 1, len(fetched)))
+    with ProcessPoolExecutor(max_workers=procs) as pool:
+        renders = [(p, pool.submit(render_player_pdf, data, out_dir)) for p, data in fetched]
+        del fetched
+        for player, future in renders:
+            try:
+                pdf_path = future.result()
+                print(f"[OK] Generated: {pdf_path}")
+            except Exception as exc:
+                print(f"[ERROR] {player}: {exc}")
 
 
 if __name__ == "__main__":
@@ -18,17 +18,30 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+import os
 import re
+import threading
 import time
 import unicodedata
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
+import orjson
 import requests
+import requests_cache
 from bs4 import BeautifulSoup
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
 
 
@@ -38,24 +51,133 @@ UA = {
     "User-Agent": "CricketRAG-IPLBuilder/1.0 (local project; public data usage)",
     "Accept": "application/json,text/html;q=0.9,*/*;q=0.8",
 }
-SESSION = requests.Session()
+# Wikipedia, Statsguru and image payloads barely change between runs, so reruns
+# are served from disk; stale entries are still used if a refresh fails.
+CACHE_PATH = ".build_cache"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+SESSION = requests_cache.CachedSession(
+    CACHE_PATH,
+    backend="sqlite",
+    expire_after=CACHE_TTL_SECONDS,
+    urls_expire_after={
+        "en.wikipedia.org/w/api.php": 7 * CACHE_TTL_SECONDS,
+        "www.wikidata.org/w/api.php": 7 * CACHE_TTL_SECONDS,
+        "stats.espncricinfo.com": CACHE_TTL_SECONDS,
+        "img1.hscicdn.com": requests_cache.NEVER_EXPIRE,
+        "upload.wikimedia.org": requests_cache.NEVER_EXPIRE,
+    },
+    allowable_codes=(200,),
+    stale_if_error=True,
+)
 SESSION.headers.update(UA)
 REQUEST_INTERVAL_SECONDS = 1.2
-_LAST_REQUEST_TS = 0.0
+# Players are fetched concurrently; pacing is per host so Wikipedia, Statsguru and
+# image CDNs overlap while each host still sees at most one request per interval.
+DEFAULT_WORKERS = 8
+# MediaWiki's per-request cap on `titles` for anonymous clients.
+WIKI_TITLES_PER_REQUEST = 50
+METADATA_FLUSH_EVERY = 25
+# Ages are computed in the main process, so reading the year once at import is
+# enough; the PDFs' "Retrieved" time travels in each record instead (see main()).
+_CURRENT_YEAR = dt.datetime.utcnow().year
+_THROTTLE_LOCK = threading.Lock()
+_NEXT_REQUEST_TS: Dict[str, float] = {}
+# Identical requests already in flight (e.g. a player listed twice) share one fetch.
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT: Dict[Tuple[str, frozenset], Future] = {}
+
+_CITE_RE = re.compile(r"\[[0-9]+\]")
+_WS_RE = re.compile(r"\s+")
+_CTRL_TABLE = {c: None for c in (*range(32), 127) if not chr(c).isspace()}
+_NAME_JSON_RE = re.compile(r'"name"\s*:\s*"([^"]+)"')
+_NEXT_DATA_RE = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+_PERSON_CELL_RE = re.compile(r"^[A-Z][A-Za-z.' -]{2,}$")
+_CRICINFO_URL_RE = re.compile(r"/cricketers/([a-z0-9-]+)-(\d+)")
+_ESPN_PID_RE = re.compile(r"^\d+$")
+_PROFILE_LINE_RE = re.compile(r"([A-Za-z .'-]+)\s*-\s*([^<]+?)\s*-\s*Player profile")
+_BORN_RE = re.compile(r"Born\s+([A-Za-z0-9, ]+)")
+_YEAR_RE = re.compile(r"(\d{4})")
+_PAREN_RE = re.compile(r"\([^)]{0,120}\)")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_WDTIME_RE = re.compile(r"^\+(\d{4}-\d{2}-\d{2})T")
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_-]+")
+_INFOBOX_START_RE = re.compile(r"\{\{\s*Infobox[ _]cricketer\b", re.IGNORECASE)
+_WT_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_WT_REF_RE = re.compile(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+_WT_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_WT_TAG_RE = re.compile(r"<[^>]+>")
+_WT_LINK_RE = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]")
+_WT_TEMPLATE_RE = re.compile(r"\{\{([^{}]*)\}\}")
+
+# `{{Infobox cricketer}}` params mapped to the labels the rendered infobox uses, so
+# derive_basic_fields() reads the same keys whichever way the infobox was parsed.
+INFOBOX_FIELD_LABELS = {
+    "fullname": "Full name",
+    "birth_date": "Born",
+    "batting": "Batting",
+    "bowling": "Bowling",
+    "role": "Role",
+    "country": "National side",
+}
+# Career stat params (`matches1`, `runs1`, ...); like the rendered table's first
+# cell, only the first column (usually the senior format) is kept.
+INFOBOX_STAT_LABELS = {
+    "matches": "Matches",
+    "runs": "Runs scored",
+    "bat avg": "Batting average",
+    "top score": "Top score",
+    "wickets": "Wickets",
+    "bowl avg": "Bowling average",
+    "best bowling": "Best bowling",
+}
+
+
+def wait_for_host_slot(url: str) -> None:
+    """Reserve the next request slot for the URL's host and sleep until it."""
+    host = urlsplit(url).netloc
+    with _THROTTLE_LOCK:
+        now = time.monotonic()
+        slot = max(now, _NEXT_REQUEST_TS.get(host, 0.0))
+        _NEXT_REQUEST_TS[host] = slot + REQUEST_INTERVAL_SECONDS
+    if slot > now:
+        time.sleep(slot - now)
 
 
 def get(url: str, params: Optional[Dict] = None, timeout: int = 30) -> requests.Response:
-    global _LAST_REQUEST_TS
+    key = (url, frozenset((params or {}).items()))
+    with _INFLIGHT_LOCK:
+        pending = _INFLIGHT.get(key)
+        if pending is None:
+            future: Future = Future()
+            _INFLIGHT[key] = future
+    if pending is not None:
+        return pending.result()
+
+    try:
+        r = fetch_with_retries(url, params, timeout)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(r)
+        return r
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[key]
+
+
+def fetch_with_retries(url: str, params: Optional[Dict], timeout: int) -> requests.Response:
     retries = 4
 
-    for attempt in range(retries):
-        now = time.monotonic()
-        wait = REQUEST_INTERVAL_SECONDS - (now - _LAST_REQUEST_TS)
-        if wait > 0:
-            time.sleep(wait)
+    # Fresh cache hits never touch the network, so they skip host pacing. A miss
+    # comes back as a synthetic 504 (also flagged from_cache), so require a real 200.
+    cached = SESSION.get(url, params=params, timeout=timeout, only_if_cached=True)
+    if cached.status_code == 200 and cached.from_cache and not cached.is_expired:
+        return cached
 
+    for attempt in range(retries):
+        wait_for_host_slot(url)
         r = SESSION.get(url, params=params, timeout=timeout)
-        _LAST_REQUEST_TS = time.monotonic()
 
         if r.status_code in (403, 429, 500, 502, 503, 504):
             if attempt < retries - 1:
@@ -73,14 +195,12 @@ def extract_players_from_espn_html(html: str) -> List[Dict[str, str]]:
     Best-effort parse of ESPN auction HTML.
     Returns list[{"name":..., "ipl_team":...}] where team may be empty.
     """
-    players: List[Dict[str, str]] = []
+    players = extract_players_from_next_data(html)
 
     # JSON-in-script fallback: look for name/team fragments.
     # This is intentionally broad because ESPN page structures can change.
-    name_candidates = set(re.findall(r'"name"\s*:\s*"([^"]+)"', html))
-    team_candidates = re.findall(r'"team(?:Name)?"\s*:\s*"([^"]+)"', html)
-
-    if name_candidates:
+    if not players:
+        name_candidates = set(_NAME_JSON_RE.findall(html))
         for n in sorted(name_candidates):
             # Avoid noise values.
             if len(n.split()) >= 2 and not n.lower().startswith(("ipl", "auction")):
@@ -88,7 +208,7 @@ def extract_players_from_espn_html(html: str) -> List[Dict[str, str]]:
 
     # HTML table fallback
     if not players:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         rows = soup.select("tr")
         for row in rows:
             tds = [td.get_text(" ", strip=True) for td in row.select("td")]
@@ -97,7 +217,7 @@ def extract_players_from_espn_html(html: str) -> List[Dict[str, str]]:
             # Heuristic: one cell with a person-like name.
             maybe_name = ""
             for cell in tds:
-                if re.match(r"^[A-Z][A-Za-z.' -]{2,}$", cell) and len(cell.split()) <= 4:
+                if _PERSON_CELL_RE.match(cell) and len(cell.split()) <= 4:
                     maybe_name = cell
                     break
             if maybe_name:
@@ -114,6 +234,49 @@ def extract_players_from_espn_html(html: str) -> List[Dict[str, str]]:
     return out
 
 
+def extract_players_from_next_data(html: str) -> List[Dict[str, str]]:
+    """
+    Read players from the page's embedded Next.js state (`__NEXT_DATA__`).
+    Any `players` list of objects counts, so the exact nesting can move around.
+    """
+    m = _NEXT_DATA_RE.search(html)
+    if not m:
+        return []
+    try:
+        data = orjson.loads(m.group(1))
+    except orjson.JSONDecodeError:
+        return []
+
+    players: List[Dict[str, str]] = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            if key == "players" and isinstance(value, list):
+                for item in value:
+                    if not isinstance(item, dict):
+                        continue
+                    # Entries are either the player object or {"player": ..., "team": ...}.
+                    person = item.get("player")
+                    if not isinstance(person, dict):
+                        person = item
+                    name = person.get("longName") or person.get("name")
+                    team = item.get("team")
+                    team_name = ""
+                    if isinstance(team, dict):
+                        team_name = team.get("longName") or team.get("name") or ""
+                    if isinstance(name, str) and name.strip():
+                        players.append({"name": name.strip(), "ipl_team": str(team_name)})
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return players
+
+
 def extract_players_from_espn(auction_url: str) -> List[Dict[str, str]]:
     r = get(auction_url, timeout=40)
     return extract_players_from_espn_html(r.text)
@@ -125,7 +288,7 @@ def parse_cricinfo_player_url(player_url: str) -> Tuple[str, str]:
     https://www.espncricinfo.com/cricketers/arshdeep-singh-1125976
     Returns (name, player_id)
     """
-    m = re.search(r"/cricketers/([a-z0-9-]+)-(\d+)", player_url)
+    m = _CRICINFO_URL_RE.search(player_url)
     if not m:
         raise ValueError(f"Invalid Cricinfo player URL: {player_url}")
     slug, pid = m.group(1), m.group(2)
@@ -133,27 +296,43 @@ def parse_cricinfo_player_url(player_url: str) -> Tuple[str, str]:
     return name, pid
 
 
-def fetch_espn_statsguru_summary(player_id: str, stat_type: str) -> Dict[str, Dict[str, str]]:
+def fetch_espn_statsguru_summary(
+    player_id: str, stat_type: str
+) -> Tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
     """
     Fetch Statsguru summary table for batting/bowling/allround.
-    Returns dict keyed by format (ODIs, T20Is, etc.) with column:value.
+    Returns (summary, profile): summary is keyed by format (ODIs, T20Is, etc.) with
+    column:value, profile is parse_espn_profile() of the same page.
     """
     url = f"https://stats.espncricinfo.com/ci/engine/player/{player_id}.html"
     params = {"class": "11", "template": "results", "type": stat_type}
     html = get(url, params=params, timeout=40).text
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_statsguru_summary(html), parse_espn_profile(html)
+
 
-    tables = soup.select("table.engineTable")
-    for table in tables:
-        rows = table.select("tr")
-        if len(rows) < 2:
+def parse_statsguru_summary(html: str) -> Dict[str, Dict[str, str]]:
+    soup = BeautifulSoup(html, "lxml")
+
+    for table in soup.find_all("table", class_="engineTable"):
+        head = table.find("thead")
+        header_row = head.find("tr") if head else table.find("tr")
+        if header_row is None:
             continue
-        headers = [clean(th.get_text(" ", strip=True)) for th in rows[0].select("th")]
+        headers = [
+            clean(th.get_text(" ", strip=True))
+            for th in header_row.find_all("th", recursive=False)
+        ]
         if "Mat" not in headers:
             continue
+        # Rows may sit directly in the table (lxml does not invent a <tbody>) or be
+        # split over several <tbody> groups, e.g. a heading group then the formats.
+        groups = [table, *table.find_all("tbody", recursive=False)]
+        rows = [row for group in groups for row in group.find_all("tr", recursive=False)]
         out: Dict[str, Dict[str, str]] = {}
-        for row in rows[1:]:
-            tds = [clean(td.get_text(" ", strip=True)) for td in row.select("td")]
+        for row in rows:
+            if row is header_row:
+                continue
+            tds = [clean(td.get_text(" ", strip=True)) for td in row.find_all("td", recursive=False)]
             if len(tds) != len(headers):
                 continue
             fmt = tds[0]
@@ -165,16 +344,13 @@ def fetch_espn_statsguru_summary(player_id: str, stat_type: str) -> Dict[str, Di
     return {}
 
 
-def fetch_espn_profile_text(player_id: str) -> Dict[str, str]:
+def parse_espn_profile(text: str) -> Dict[str, str]:
     """
-    Fetch basic profile label line from Statsguru page text.
+    Parse basic profile label line from Statsguru page text.
     Example: 'Arshdeep Singh - left-hand bat; left-arm medium-fast - Player profile'
     """
-    url = f"https://stats.espncricinfo.com/ci/engine/player/{player_id}.html"
-    params = {"class": "11", "type": "allround"}
-    text = get(url, params=params, timeout=40).text
-    line_m = re.search(r"([A-Za-z .'-]+)\s*-\s*([^<]+?)\s*-\s*Player profile", text)
-    born_m = re.search(r"Born\\s+([A-Za-z0-9, ]+)", text)
+    line_m = _PROFILE_LINE_RE.search(text)
+    born_m = _BORN_RE.search(text)
     profile = {}
     if line_m:
         profile["profile_line"] = clean(line_m.group(0))
@@ -183,21 +359,74 @@ def fetch_espn_profile_text(player_id: str) -> Dict[str, str]:
     return profile
 
 
-def fetch_wiki_player(name: str) -> Dict:
-    params = {
-        "action": "query",
-        "format": "json",
-        "prop": "extracts|pageprops|info",
-        "inprop": "url",
-        "explaintext": 1,
-        "redirects": 1,
-        "titles": name,
-        "origin": "*",
-    }
-    payload = get(WIKI_API, params=params).json()
-    pages = payload.get("query", {}).get("pages", {})
-    page = next(iter(pages.values()))
-    if "missing" in page:
+def fetch_wiki_pages_batch(names: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch extract, URL, Wikidata id, thumbnail and wikitext for many titles at once.
+    Returns {requested_name: page}; pages Wikipedia does not have carry "missing".
+    """
+    unique = list(dict.fromkeys(names))
+    out: Dict[str, Dict] = {}
+    for start in range(0, len(unique), WIKI_TITLES_PER_REQUEST):
+        chunk = unique[start : start + WIKI_TITLES_PER_REQUEST]
+        params = {
+            "action": "query",
+            "format": "json",
+            "prop": "extracts|pageimages|pageprops|info|revisions",
+            "inprop": "url",
+            "rvprop": "content",
+            "rvslots": "main",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": "max",
+            "pithumbsize": 600,
+            "pilimit": "max",
+            "redirects": 1,
+            "titles": "|".join(chunk),
+            "origin": "*",
+        }
+        aliases: Dict[str, str] = {}
+        by_title: Dict[str, Dict] = {}
+        cont: Dict[str, str] = {}
+        # Pages are stamped with the oldest response they came from; cached ones may
+        # be days old, and the PDF's "Retrieved" line should say so.
+        retrieved: Optional[dt.datetime] = None
+        while True:
+            r = get(WIKI_API, params={**params, **cont})
+            when = fetched_at(r)
+            retrieved = when if retrieved is None else min(retrieved, when)
+            payload = orjson.loads(r.content)
+            query = payload.get("query", {})
+            for item in query.get("normalized", []) + query.get("redirects", []):
+                aliases[item["from"]] = item["to"]
+            # Extracts are capped per response, so a page's fields can arrive over
+            # several continuation rounds; merge them by title.
+            for page in query.get("pages", {}).values():
+                by_title.setdefault(page.get("title", ""), {}).update(page)
+            cont = payload.get("continue", {})
+            if not cont:
+                break
+        stamp = retrieved.replace(tzinfo=None).isoformat()
+        for name in chunk:
+            title = aliases.get(name, name)
+            title = aliases.get(title, title)
+            page = by_title.get(title, {"title": name, "missing": ""})
+            out[name] = {**page, "retrieved_at": stamp}
+    return out
+
+
+def fetched_at(r: requests.Response) -> dt.datetime:
+    """When the response's content was fetched: its cache entry's age, or now."""
+    created = getattr(r, "created_at", None) if getattr(r, "from_cache", False) else None
+    if created is None:
+        return dt.datetime.now(dt.timezone.utc)
+    # requests-cache < 1.2 stores naive UTC times; make them comparable with now().
+    return created if created.tzinfo else created.replace(tzinfo=dt.timezone.utc)
+
+
+def fetch_wiki_player(name: str, page: Optional[Dict] = None) -> Dict:
+    if page is None:
+        page = fetch_wiki_pages_batch([name])[name]
+    if "missing" in page or "invalid" in page:
         raise ValueError(f"Wikipedia page not found: {name}")
 
     title = page.get("title", name)
@@ -205,20 +434,26 @@ def fetch_wiki_player(name: str) -> Dict:
     url = page.get("fullurl", f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}")
     qid = page.get("pageprops", {}).get("wikibase_item")
 
-    html = get(
-        WIKI_API,
-        params={
-            "action": "parse",
-            "format": "json",
-            "redirects": 1,
-            "page": title,
-            "prop": "text",
-            "origin": "*",
-        },
-    ).json()
-    html_text = html.get("parse", {}).get("text", {}).get("*", "")
-    info = parse_infobox(html_text)
-    image_url = fetch_page_image(title)
+    revisions = page.get("revisions") or [{}]
+    wikitext = revisions[0].get("slots", {}).get("main", {}).get("*", "")
+    info = parse_infobox_wikitext(wikitext)
+    if not info:
+        # Pages without the cricketer template: fall back to the rendered infobox.
+        html = orjson.loads(
+            get(
+                WIKI_API,
+                params={
+                    "action": "parse",
+                    "format": "json",
+                    "redirects": 1,
+                    "page": title,
+                    "prop": "text",
+                    "origin": "*",
+                },
+            ).content
+        )
+        info = parse_infobox(html.get("parse", {}).get("text", {}).get("*", ""))
+    image_url = page.get("thumbnail", {}).get("source", "")
 
     return {
         "name": title,
@@ -227,11 +462,12 @@ def fetch_wiki_player(name: str) -> Dict:
         "qid": qid,
         "infobox": info,
         "image_url": image_url,
+        "retrieved_at": page.get("retrieved_at", ""),
     }
 
 
 def parse_infobox(html: str) -> Dict[str, str]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     box = soup.find("table", class_=lambda c: c and "infobox" in c)
     result: Dict[str, str] = {}
     if not box:
@@ -248,32 +484,180 @@ def parse_infobox(html: str) -> Dict[str, str]:
     return result
 
 
-def fetch_page_image(title: str) -> str:
-    params = {
-        "action": "query",
-        "format": "json",
-        "prop": "pageimages",
-        "pithumbsize": 600,
-        "redirects": 1,
-        "titles": title,
-        "origin": "*",
-    }
-    payload = get(WIKI_API, params=params).json()
-    pages = payload.get("query", {}).get("pages", {})
-    page = next(iter(pages.values()))
-    return page.get("thumbnail", {}).get("source", "")
+def parse_infobox_wikitext(wikitext: str) -> Dict[str, str]:
+    """
+    Extract fields from the `{{Infobox cricketer}}` template in page wikitext.
+    Keys use the same labels as the rendered infobox (Born, Role, ...).
+    """
+    params = split_infobox_params(wikitext)
+    fields: Dict[str, str] = {}
+    if not params:
+        return fields
+
+    for key, label in INFOBOX_FIELD_LABELS.items():
+        val = clean_wikitext(params.get(key, ""))
+        if val:
+            fields[label] = val
+    place = clean_wikitext(params.get("birth_place", ""))
+    if place:
+        fields["Born"] = f"{fields['Born']}, {place}" if "Born" in fields else place
+    for key, label in INFOBOX_STAT_LABELS.items():
+        val = clean_wikitext(params.get(f"{key}1", ""))
+        if val:
+            fields[label] = val
+    return fields
+
+
+def split_infobox_params(wikitext: str) -> Dict[str, str]:
+    """Return the raw `key = value` params of the cricketer infobox template."""
+    m = _INFOBOX_START_RE.search(wikitext)
+    if not m:
+        return {}
+
+    # Split on top-level pipes only; nested templates and links have their own.
+    parts: List[str] = []
+    braces, brackets = 1, 0
+    start = i = m.end()
+    while i < len(wikitext):
+        pair = wikitext[i : i + 2]
+        if pair in ("{{", "}}", "[[", "]]"):
+            if pair == "{{":
+                braces += 1
+            elif pair == "}}":
+                braces -= 1
+                if braces == 0:
+                    break
+            elif pair == "[[":
+                brackets += 1
+            else:
+                brackets = max(0, brackets - 1)
+            i += 2
+            continue
+        if wikitext[i] == "|" and braces == 1 and brackets == 0:
+            parts.append(wikitext[start:i])
+            start = i + 1
+        i += 1
+    parts.append(wikitext[start:i])
+
+    params: Dict[str, str] = {}
+    for part in parts[1:]:  # parts[0] is the rest of the template name
+        key, sep, val = part.partition("=")
+        if sep:
+            params[key.strip().lower()] = val.strip()
+    return params
+
+
+def clean_wikitext(value: str) -> str:
+    """Flatten a wikitext value (links, refs, simple templates) to plain text."""
+    if not value:
+        return ""
+    value = _WT_COMMENT_RE.sub("", value)
+    value = _WT_REF_RE.sub("", value)
+    value = _WT_BR_RE.sub(" ", value)
+    value = _WT_TAG_RE.sub("", value)
+    value = _WT_LINK_RE.sub(lambda m: m.group(1), value)
+    for _ in range(5):  # innermost templates first
+        value, n = _WT_TEMPLATE_RE.subn(lambda m: render_template(m.group(1)), value)
+        if not n:
+            break
+    value = value.replace("'''", "").replace("''", "").replace("&nbsp;", " ")
+    return clean(value)
+
+
+def render_template(inner: str) -> str:
+    """Render the few inline templates used in cricketer infoboxes."""
+    parts = [p.strip() for p in inner.split("|")]
+    name = parts[0].lower()
+    args = [p for p in parts[1:] if p and "=" not in p]
+    if name.startswith(("birth date", "death date", "start date", "dob")):
+        nums = [a for a in args if a.isdigit()][:3]
+        if len(nums) == 3:
+            return f"{nums[0]}-{int(nums[1]):02d}-{int(nums[2]):02d}"
+        return "-".join(nums)
+    if name in ("hlist", "ubl", "unbulleted list", "flatlist", "plainlist", "nowrap", "nobr", "small"):
+        return ", ".join(args)
+    return ""
 
 
-def derive_basic_fields(infobox: Dict[str, str], ipl_team: str) -> Dict[str, str]:
-    born = infobox.get("Born", "")
+def fetch_wd_entities(qids: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Date of birth (P569) and citizenship (P27) for many Wikidata items at once.
+    Returns {qid: {"born": "YYYY-MM-DD", "country": label}} with whichever are known.
+    """
+    ids = list(dict.fromkeys(q for q in qids if q))
+    out: Dict[str, Dict[str, str]] = {}
+    country_ids: Dict[str, str] = {}
+    for start in range(0, len(ids), WIKI_TITLES_PER_REQUEST):
+        params = {
+            "action": "wbgetentities",
+            "format": "json",
+            "ids": "|".join(ids[start : start + WIKI_TITLES_PER_REQUEST]),
+            "props": "claims",
+        }
+        payload = orjson.loads(get(WD_API, params=params).content)
+        for qid, entity in payload.get("entities", {}).items():
+            claims = entity.get("claims", {})
+            fields: Dict[str, str] = {}
+            dob = first_claim_value(claims, "P569")
+            m = _WDTIME_RE.match(dob.get("time", "")) if isinstance(dob, dict) else None
+            if m:
+                fields["born"] = m.group(1)
+            country = first_claim_value(claims, "P27")
+            if isinstance(country, dict) and country.get("id"):
+                country_ids[qid] = country["id"]
+            out[qid] = fields
+
+    # Citizenship claims point at other items; resolve all their labels together.
+    labels = fetch_wd_labels(list(country_ids.values()))
+    for qid, country_id in country_ids.items():
+        if labels.get(country_id):
+            out[qid]["country"] = labels[country_id]
+    return out
+
+
+def fetch_wd_labels(qids: List[str]) -> Dict[str, str]:
+    ids = list(dict.fromkeys(qids))
+    out: Dict[str, str] = {}
+    for start in range(0, len(ids), WIKI_TITLES_PER_REQUEST):
+        params = {
+            "action": "wbgetentities",
+            "format": "json",
+            "ids": "|".join(ids[start : start + WIKI_TITLES_PER_REQUEST]),
+            "props": "labels",
+            "languages": "en",
+        }
+        payload = orjson.loads(get(WD_API, params=params).content)
+        for qid, entity in payload.get("entities", {}).items():
+            label = entity.get("labels", {}).get("en", {}).get("value", "")
+            if label:
+                out[qid] = clean(label)
+    return out
+
+
+def first_claim_value(claims: Dict, prop: str):
+    for claim in claims.get(prop, []):
+        value = claim.get("mainsnak", {}).get("datavalue", {}).get("value")
+        if value:
+            return value
+    return None
+
+
+def derive_basic_fields(
+    infobox: Dict[str, str], ipl_team: str, wikidata: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    wikidata = wikidata or {}
+    # Wikidata's structured birth date beats scraping a year out of infobox text.
+    born = wikidata.get("born") or infobox.get("Born", "")
     age = extract_age_from_born(born)
     runs = find_value(infobox, ["Runs", "Runs scored", "IPL runs"])
     wickets = find_value(infobox, ["Wickets", "IPL wickets"])
     matches = find_value(infobox, ["Matches", "No. of IPL matches", "IPL matches"])
     role = infobox.get("Role", "")
+    # The national side is the cricket team; citizenship (P27) can differ, e.g.
+    # "United Kingdom" for England players, so it is only a last resort.
     country = infobox.get("National side", "")
     if not country:
-        country = find_value(infobox, ["Country"])
+        country = find_value(infobox, ["Country"]) or wikidata.get("country", "")
     current_team = ipl_team or find_value(infobox, ["Current team", "Team"])
 
     return {
@@ -288,14 +672,13 @@ def derive_basic_fields(infobox: Dict[str, str], ipl_team: str) -> Dict[str, str
 
 
 def extract_age_from_born(born_text: str) -> str:
-    m = re.search(r"(\d{4})", born_text)
+    m = _YEAR_RE.search(born_text)
     if not m:
         return ""
     year = int(m.group(1))
-    now = dt.datetime.utcnow().year
-    if year < 1900 or year > now:
+    if year < 1900 or year > _CURRENT_YEAR:
         return ""
-    return str(now - year)
+    return str(_CURRENT_YEAR - year)
 
 
 def find_value(infobox: Dict[str, str], keys: List[str]) -> str:
@@ -311,22 +694,20 @@ def find_value(infobox: Dict[str, str], keys: List[str]) -> str:
 
 
 def clean(v: str) -> str:
-    v = re.sub(r"\[[0-9]+\]", "", v)
-    v = re.sub(r"\s+", " ", v).strip()
-    return sanitize_for_pdf(v)
+    # sanitize_for_pdf already collapses whitespace; only citations are extra here.
+    return sanitize_for_pdf(_CITE_RE.sub("", v))
 
 
+@lru_cache(maxsize=4096)
 def sanitize_for_pdf(text: str) -> str:
     """Normalize text to avoid unsupported glyphs in default PDF fonts."""
     if not text:
         return ""
-    t = unicodedata.normalize("NFKD", text)
-    # Remove control chars and non-printables.
-    t = "".join(ch for ch in t if ch == "\n" or (ord(ch) >= 32 and ch.isprintable()))
-    # Default reportlab fonts handle ASCII reliably.
+    # Drop ASCII control chars (whitespace is collapsed below); everything else that is
+    # not ASCII goes in the encode step, since default reportlab fonts handle ASCII reliably.
+    t = unicodedata.normalize("NFKD", text).translate(_CTRL_TABLE)
     t = t.encode("ascii", "ignore").decode("ascii")
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
+    return _WS_RE.sub(" ", t).strip()
 
 
 def build_safe_summary(extract: str) -> str:
@@ -336,8 +717,8 @@ def build_safe_summary(extract: str) -> str:
     """
     if not extract:
         return "N/A"
-    txt = re.sub(r"\([^)]{0,120}\)", "", extract)
-    parts = re.split(r"(?<=[.!?])\s+", txt)
+    txt = _PAREN_RE.sub("", extract)
+    parts = _SENTENCE_END_RE.split(txt)
     summary = " ".join(parts[:2]).strip()
     return sanitize_for_pdf(summary) or "N/A"
 
@@ -354,20 +735,101 @@ def download_image(url: str, out_path: Path) -> str:
         return ""
 
 
+def output_stem(title: str) -> str:
+    """File name (without extension) shared by a player's PDF and image."""
+    return _SAFE_RE.sub("_", title).strip("_")
+
+
+def collect_player(
+    p: Dict[str, str],
+    images_dir: Path,
+    log_prefix: str,
+    page: Optional[Dict] = None,
+    wikidata: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Dict:
+    """Network half of one player: Wikipedia, optional Statsguru, and the image."""
+    raw_name = p["name"]
+    wp = fetch_wiki_player(raw_name, page)
+    wd = (wikidata or {}).get(wp["qid"] or "", {})
+    basic = derive_basic_fields(wp["infobox"], p.get("ipl_team", ""), wd)
+    espn_player_id = p.get("espn_player_id", "")
+    espn_stats_summary: Dict[str, str] = {}
+    if espn_player_id and not _ESPN_PID_RE.match(espn_player_id):
+        # Statsguru ids are numeric; anything else would only fetch an error page.
+        print(f"{log_prefix} WARN bad ESPN player id {espn_player_id!r} for {raw_name}")
+        espn_player_id = ""
+    if espn_player_id:
+        try:
+            # The profile line is on every Statsguru page; take it from the batting one.
+            bat, profile = fetch_espn_statsguru_summary(espn_player_id, "batting")
+            bowl, _ = fetch_espn_statsguru_summary(espn_player_id, "bowling")
+            t20_bat = bat.get("T20Is", {})
+            t20_bowl = bowl.get("T20Is", {})
+            odi_bat = bat.get("ODIs", {})
+            odi_bowl = bowl.get("ODIs", {})
+
+            espn_stats_summary = {
+                "Profile": profile.get("profile_line", ""),
+                "Born": profile.get("born", ""),
+                "T20I matches": t20_bat.get("Mat", ""),
+                "T20I runs": t20_bat.get("Runs", ""),
+                "T20I wickets": t20_bowl.get("Wkts", ""),
+                "ODI matches": odi_bat.get("Mat", ""),
+                "ODI runs": odi_bat.get("Runs", ""),
+                "ODI wickets": odi_bowl.get("Wkts", ""),
+            }
+            # Prefer Cricinfo figures if present.
+            basic["matches"] = basic["matches"] or t20_bat.get("Mat", "")
+            basic["runs"] = basic["runs"] or t20_bat.get("Runs", "")
+            basic["wickets"] = basic["wickets"] or t20_bowl.get("Wkts", "")
+        except Exception as exc:
+            print(f"{log_prefix} WARN ESPN stats unavailable for {raw_name}: {exc}")
+
+    file_stem = output_stem(wp["name"])
+    image_file = images_dir / f"{file_stem}.jpg"
+    image_local = download_image(wp.get("image_url", ""), image_file)
+
+    return {
+        "file_stem": file_stem,
+        "espn_player_id": espn_player_id,
+        "record": {
+            "name": wp["name"],
+            "basic": basic,
+            "extract": wp.get("extract", ""),
+            "wiki_url": wp.get("url", ""),
+            "image_path": image_local,
+            "espn_stats": espn_stats_summary,
+            "retrieved_at": wp["retrieved_at"],
+        },
+    }
+
+
+@lru_cache(maxsize=8192)
+def word_width(word: str) -> float:
+    """Helvetica 10pt width of `word`; the same words recur across lines and PDFs."""
+    return stringWidth(word, "Helvetica", 10)
+
+
 def draw_wrapped(c: canvas.Canvas, text: str, x: float, y: float, width: float) -> float:
     words = text.split()
     if not words:
         return y
-    line = words[0]
-    for w in words[1:]:
-        cand = f"{line} {w}"
-        if c.stringWidth(cand, "Helvetica", 10) <= width:
-            line = cand
+    # Helvetica has no kerning, so a candidate line's width is the current width
+    # plus a space plus the next word; each word is measured once up front.
+    widths = [word_width(w) for w in words]
+    space_w = word_width(" ")
+    start = 0
+    line_w = widths[0]
+    for i in range(1, len(words)):
+        cand_w = line_w + space_w + widths[i]
+        if cand_w <= width:
+            line_w = cand_w
         else:
-            c.drawString(x, y, line)
+            c.drawString(x, y, " ".join(words[start:i]))
             y -= 14
-            line = w
-    c.drawString(x, y, line)
+            start = i
+            line_w = widths[i]
+    c.drawString(x, y, " ".join(words[start:]))
     return y - 14
 
 
@@ -433,12 +895,20 @@ def write_pdf(player: Dict, output_pdf: Path, image_path: str) -> None:
     y -= 14
     c.setFont("Helvetica", 9)
     source_line = sanitize_for_pdf(
-        f"Wikipedia: {player.get('wiki_url', '')} | Retrieved: {dt.datetime.utcnow().isoformat()} UTC"
+        f"Wikipedia: {player.get('wiki_url', '')} | Retrieved: {player['retrieved_at']} UTC"
     )
     draw_wrapped(c, source_line, x, y, w - 4 * cm)
     c.save()
 
 
+def save_metadata(metadata_path: Path, metadata: Dict[str, Dict]) -> None:
+    """Write metadata via a temp file so readers never see a half-written JSON."""
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = metadata_path.with_suffix(".json.tmp")
+    tmp.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    tmp.replace(metadata_path)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--auction-url", default="")
@@ -469,7 +939,18 @@ def main() -> None:
         "--request-interval",
         type=float,
         default=1.2,
-        help="Seconds between outbound HTTP requests (to reduce forbidden/rate limits).",
+        help="Seconds between HTTP requests to the same host (to reduce forbidden/rate limits).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Players fetched concurrently.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild players even if their PDF from a previous run exists.",
     )
     args = parser.parse_args()
     global REQUEST_INTERVAL_SECONDS
@@ -521,74 +1002,140 @@ def main() -> None:
     existing_metadata: Dict[str, Dict] = {}
     if metadata_path.exists():
         try:
-            existing_metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            existing_metadata = orjson.loads(metadata_path.read_bytes())
         except Exception:
             existing_metadata = {}
 
-    metadata: Dict[str, Dict] = {}
-    success_count = 0
+    # Players whose PDF (and image, if one was saved) from an earlier run is still on
+    # disk are kept as-is. Input names are checked before any request is made; the
+    # rest are checked again under their resolved Wikipedia title.
+    existing_by_key = {k.strip().lower(): v for k, v in existing_metadata.items()}
+
+    def already_built(name: str) -> bool:
+        done = existing_by_key.get(name.strip().lower())
+        if args.force or not done or not Path(done.get("pdf_path", "")).exists():
+            return False
+        image_path = done.get("image_path", "")
+        return not image_path or Path(image_path).exists()
+
+    remaining: List[Tuple[int, Dict[str, str]]] = []
     for i, p in enumerate(players, start=1):
-        raw_name = p["name"]
+        if already_built(p["name"]):
+            print(f"[{i}/{len(players)}] SKIP {p['name']} (PDF exists)")
+            continue
+        remaining.append((i, p))
+
+    # Page metadata for everyone comes from a handful of batched queries; the rest of
+    # the network phase runs concurrently with PDF rendering (see below).
+    # A failed batch only fails its own players; the others still build and the
+    # metadata is still saved.
+    names = list(dict.fromkeys(p["name"] for _, p in remaining))
+    pages: Dict[str, Dict] = {}
+    page_errors: Dict[str, Exception] = {}
+    for start in range(0, len(names), WIKI_TITLES_PER_REQUEST):
+        chunk = names[start : start + WIKI_TITLES_PER_REQUEST]
         try:
-            wp = fetch_wiki_player(raw_name)
-            basic = derive_basic_fields(wp["infobox"], p.get("ipl_team", ""))
-            espn_player_id = p.get("espn_player_id", "")
-            espn_stats_summary: Dict[str, str] = {}
-            if espn_player_id:
+            pages.update(fetch_wiki_pages_batch(chunk))
+        except Exception as exc:
+            page_errors.update((name, exc) for name in chunk)
+
+    todo: List[Tuple[int, Dict[str, str]]] = []
+    claimed: Dict[str, str] = {}
+    for i, p in remaining:
+        if p["name"] in page_errors:
+            print(f"[{i}/{len(players)}] ERROR {p['name']}: {page_errors[p['name']]}")
+            continue
+        title = pages[p["name"]].get("title", p["name"])
+        if already_built(title):
+            print(f"[{i}/{len(players)}] SKIP {title} (PDF exists)")
+            continue
+        # Inputs resolving to the same page would download the same image and render
+        # the same PDF concurrently; only the first one is built.
+        stem = output_stem(title)
+        if stem in claimed:
+            print(f"[{i}/{len(players)}] SKIP {p['name']} (same page as {claimed[stem]!r})")
+            continue
+        claimed[stem] = p["name"]
+        todo.append((i, p))
+
+    qids = [pages[p["name"]].get("pageprops", {}).get("wikibase_item", "") for _, p in todo]
+    try:
+        wikidata = fetch_wd_entities(qids)
+    except Exception as exc:
+        print(f"WARN Wikidata unavailable, using infobox fields only: {exc}")
+        wikidata = {}
+
+    # Players are collected on a thread pool; each one's PDF goes to a process pool
+    # (rendering is CPU-bound reportlab work with no shared state) as soon as its
+    # data is in, and its metadata is recorded once the PDF is written, so periodic
+    # flushes cover players finished while the rest are still being fetched.
+    finished: Dict[int, Dict] = {}
+    success_count = 0
+    run_utc_iso = dt.datetime.utcnow().isoformat()
+
+    def merged_metadata() -> Dict[str, Dict]:
+        # Sorted by input position so the file's order doesn't depend on timing.
+        new = {entry["name"]: entry for _, entry in sorted(finished.items())}
+        return {**existing_metadata, **new}
+
+    workers = max(1, min(args.workers, len(todo)))
+    procs = max(1, min(os.cpu_count() or 1, len(todo)))
+    with ThreadPoolExecutor(max_workers=workers) as threads, ProcessPoolExecutor(
+        max_workers=procs
+    ) as pool:
+        collects: Dict[Future, Tuple[int, Dict[str, str]]] = {
+            threads.submit(
+                collect_player,
+                p,
+                images_dir,
+                f"[{i}/{len(players)}]",
+                pages[p["name"]],
+                wikidata,
+            ): (i, p)
+            for i, p in todo
+        }
+        renders: Dict[Future, Tuple[int, Dict[str, str], Dict, Path]] = {}
+        while collects or renders:
+            done, _ = wait([*collects, *renders], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in collects:
+                    i, p = collects.pop(future)
+                    try:
+                        item = future.result()
+                    except Exception as exc:
+                        print(f"[{i}/{len(players)}] ERROR {p['name']}: {exc}")
+                        continue
+                    record = item["record"]
+                    # Falls back to a time taken here rather than at import: render
+                    # workers may re-import the module (spawn/forkserver) and read
+                    # their own clock.
+                    record["retrieved_at"] = record.get("retrieved_at") or run_utc_iso
+                    pdf_path = out_dir / f"{item['file_stem']}.pdf"
+                    render = pool.submit(write_pdf, record, pdf_path, record["image_path"])
+                    renders[render] = (i, p, item, pdf_path)
+                    continue
+
+                i, p, item, pdf_path = renders.pop(future)
+                record = item["record"]
                 try:
-                    profile = fetch_espn_profile_text(espn_player_id)
-                    bat = fetch_espn_statsguru_summary(espn_player_id, "batting")
-                    bowl = fetch_espn_statsguru_summary(espn_player_id, "bowling")
-                    t20_bat = bat.get("T20Is", {})
-                    t20_bowl = bowl.get("T20Is", {})
-                    odi_bat = bat.get("ODIs", {})
-                    odi_bowl = bowl.get("ODIs", {})
-
-                    espn_stats_summary = {
-                        "Profile": profile.get("profile_line", ""),
-                        "Born": profile.get("born", ""),
-                        "T20I matches": t20_bat.get("Mat", ""),
-                        "T20I runs": t20_bat.get("Runs", ""),
-                        "T20I wickets": t20_bowl.get("Wkts", ""),
-                        "ODI matches": odi_bat.get("Mat", ""),
-                        "ODI runs": odi_bat.get("Runs", ""),
-                        "ODI wickets": odi_bowl.get("Wkts", ""),
-                    }
-                    # Prefer Cricinfo figures if present.
-                    basic["matches"] = basic["matches"] or t20_bat.get("Mat", "")
-                    basic["runs"] = basic["runs"] or t20_bat.get("Runs", "")
-                    basic["wickets"] = basic["wickets"] or t20_bowl.get("Wkts", "")
+                    future.result()
                 except Exception as exc:
-                    print(f"[{i}/{len(players)}] WARN ESPN stats unavailable for {raw_name}: {exc}")
-
-            file_stem = re.sub(r"[^A-Za-z0-9_-]+", "_", wp["name"]).strip("_")
-            image_file = images_dir / f"{file_stem}.jpg"
-            image_local = download_image(wp.get("image_url", ""), image_file)
-            pdf_path = out_dir / f"{file_stem}.pdf"
-
-            record = {
-                "name": wp["name"],
-                "basic": basic,
-                "extract": wp.get("extract", ""),
-                "wiki_url": wp.get("url", ""),
-                "image_path": image_local,
-                "espn_stats": espn_stats_summary,
-            }
-            write_pdf(record, pdf_path, image_local)
-
-            metadata[wp["name"]] = {
-                "name": wp["name"],
-                "pdf_path": str(pdf_path),
-                "image_path": image_local,
-                "espn_player_id": espn_player_id,
-                "espn_player_url": p.get("player_url", ""),
-                "espn_stats": espn_stats_summary,
-                **basic,
-            }
-            success_count += 1
-            print(f"[{i}/{len(players)}] OK {wp['name']}")
-        except Exception as exc:
-            print(f"[{i}/{len(players)}] ERROR {raw_name}: {exc}")
+                    print(f"[{i}/{len(players)}] ERROR {p['name']}: {exc}")
+                    continue
+                finished[i] = {
+                    "name": record["name"],
+                    "pdf_path": str(pdf_path),
+                    "image_path": record["image_path"],
+                    "espn_player_id": item["espn_player_id"],
+                    "espn_player_url": p.get("player_url", ""),
+                    "espn_stats": record["espn_stats"],
+                    **record["basic"],
+                }
+                success_count += 1
+                print(f"[{i}/{len(players)}] OK {record['name']}")
+                # Flush periodically so a crash later in the run keeps finished players.
+                if success_count % METADATA_FLUSH_EVERY == 0:
+                    save_metadata(metadata_path, merged_metadata())
 
     if success_count == 0 and existing_metadata:
         print(
@@ -596,8 +1143,7 @@ def main() -> None:
             "Keeping existing player_metadata.json unchanged."
         )
     else:
-        merged = {**existing_metadata, **metadata}
-        metadata_path.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+        save_metadata(metadata_path, merged_metadata())
         print(f"Saved metadata: {metadata_path}")
 
 
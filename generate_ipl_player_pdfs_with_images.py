@@ -1,7 +1,10 @@
 import os
-import json
-import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image
 from io import BytesIO
 from tqdm import tqdm
@@ -10,62 +13,99 @@ from tqdm import tqdm
 JSON_PATH = "/Users/akashparthe/Desktop/Git Demo/Retrieval System/data/player_metadata.json"
 IMAGE_DIR = "data/images"
 
-REQUEST_DELAY = 2
 TIMEOUT = 20
+POOL_SIZE = 16
+DOWNLOAD_WORKERS = 8
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (ImageCollector/1.0)",
     "Accept-Language": "en-US,en;q=0.9"
 }
 
+# A plain session, not the builder's requests-cache one: a cached session reads the
+# whole body into memory (and SQLite) before returning, which defeats streaming, and
+# the saved files in IMAGE_DIR already let reruns skip finished players.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+# Every image comes from the same CDN host, so keep its TLS connections warm and let
+# urllib3 back off on throttling (honouring Retry-After) instead of sleeping each time.
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        ),
+    ),
+)
+
 os.makedirs(IMAGE_DIR, exist_ok=True)
 
 # ---------------- SAFE IMAGE DOWNLOAD ----------------
 def download_image(url, save_path):
+    part_path = save_path + ".part"
     try:
-        r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-        r.raise_for_status()
-        Image.open(BytesIO(r.content)).convert("RGB").save(save_path)
+        with SESSION.get(url, stream=True, timeout=TIMEOUT) as r:
+            r.raise_for_status()
+            content_type = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type == "image/jpeg":
+                # Already what we store: copy the bytes instead of decoding and re-encoding.
+                r.raw.decode_content = True
+                with open(part_path, "wb") as f:
+                    shutil.copyfileobj(r.raw, f, length=64 * 1024)
+                os.replace(part_path, save_path)
+            else:
+                Image.open(BytesIO(r.content)).convert("RGB").save(save_path)
         return True
     except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
         return False
 
-# ---------------- MAIN ----------------
-def main():
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        players = json.load(f)
-
-    for player_name, data in tqdm(players.items(), desc="Downloading images"):
-        if data.get("image_path"):
-            continue  # already exists
+# ---------------- PER-PLAYER ----------------
+def download_player_image(player_name, data):
+    # 🔹 Image source priority:
+    # 1. Explicit image_url (if you add later)
+    # 2. ESPN Cricinfo player image CDN pattern
+    # 3. Skip safely if not found
 
-        # 🔹 Image source priority:
-        # 1. Explicit image_url (if you add later)
-        # 2. ESPN Cricinfo player image CDN pattern
-        # 3. Skip safely if not found
+    image_url = data.get("image_url")
 
-        image_url = data.get("image_url")
+    if not image_url:
+        # ESPN Cricinfo common CDN pattern (works for many players)
+        slug = player_name.lower().replace(" ", "-")
+        image_url = f"https://img1.hscicdn.com/image/upload/f_auto,q_auto/lsci/db/PICTURES/CMS/{slug}.jpg"
 
-        if not image_url:
-            # ESPN Cricinfo common CDN pattern (works for many players)
-            slug = player_name.lower().replace(" ", "-")
-            image_url = f"https://img1.hscicdn.com/image/upload/f_auto,q_auto/lsci/db/PICTURES/CMS/{slug}.jpg"
+    image_filename = player_name.replace(" ", "_") + ".jpg"
+    image_path = os.path.join(IMAGE_DIR, image_filename)
 
-        image_filename = player_name.replace(" ", "_") + ".jpg"
-        image_path = os.path.join(IMAGE_DIR, image_filename)
+    return image_path if download_image(image_url, image_path) else ""
 
-        success = download_image(image_url, image_path)
-
-        if success:
-            data["image_path"] = image_path
-        else:
-            data["image_path"] = ""
-
-        time.sleep(REQUEST_DELAY)
+# ---------------- MAIN ----------------
+def main():
+    with open(JSON_PATH, "rb") as f:
+        players = orjson.loads(f.read())
+
+    # Skip players that already have an image.
+    pending = {name: data for name, data in players.items() if not data.get("image_path")}
+
+    # Downloads are I/O-bound and share the pooled session; paths are assigned back
+    # here so only the main thread touches `players`.
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = {
+            pool.submit(download_player_image, name, data): name
+            for name, data in pending.items()
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading images"):
+            players[futures[future]]["image_path"] = future.result()
 
     # ---------------- SAVE UPDATED JSON ----------------
-    with open(JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(players, f, indent=2, ensure_ascii=False)
+    with open(JSON_PATH, "wb") as f:
+        f.write(orjson.dumps(players, option=orjson.OPT_INDENT_2))
 
     print("✅ Image paths updated successfully!")
 